@@ -1,7 +1,13 @@
+import copy
+import itertools
+import os
 import random
+import shutil
+import tempfile
 from collections import deque
 
 import config
+import external
 from state import State
 
 import heapq
@@ -13,16 +19,19 @@ class Node:
         self.action = action
         self.cost = 0
         self.cost_heuristic = 0
+        self.priority = 0
         self.parent = None
 
     def __lt__(self, other):
-        return (self.cost + self.cost_heuristic) < (other.cost + other.cost_heuristic)
+        return self.priority < other.priority
 
-    def add_child(self, child, is_heuristic_algorithm):
+    # heuristic_weight multiplies h (0 disables it), greedy orders by h alone
+    def add_child(self, child, heuristic_weight=0, greedy=False):
         child.parent = self
         child.cost = child.parent.cost + State.get_action_cost(child.action)
-        if is_heuristic_algorithm:
-            child.cost_heuristic = child.parent.cost_heuristic + self.calc_heuristic(child.state)
+        if heuristic_weight:
+            child.cost_heuristic = heuristic_weight * self.calc_heuristic(child.state)
+        child.priority = child.cost_heuristic if greedy else child.cost + child.cost_heuristic
 
     def get_actions(self):
         actions = []
@@ -42,57 +51,38 @@ class Node:
             parent_node = parent_node.parent
         return False
 
+    # Sum over goals of the Manhattan distance to the nearest spaceship.
+    # Every goal needs its own spaceship and a slide costs at least the
+    # Manhattan distance it covers, so this never overestimates (admissible).
     def calc_heuristic(self, state):
-        goals = self.get_coordinates(state.goals)
-        spaceships = self.get_coordinates(state.spaceships)
+        spaceships = []
+        bits = state.spaceships
+        while bits:
+            spaceships.append((bits & -bits).bit_length() - 1)
+            bits &= bits - 1
 
-        total_distance = 0
-
-        for goal in goals:
-            min_distance = float('inf')
-
-            for spaceship in spaceships:
-                distance = abs(goal[0] - spaceship[0]) + abs(goal[1] - spaceship[1])
-                min_distance = min(min_distance, distance)
-
-            total_distance += min_distance
-
-        return total_distance
-
-
-    def get_coordinates(self, decimal_number):
-        rows = config.N
-        cols = config.M
-        num = str(bin(decimal_number))[2:]
-        string = reversed(num)
-        coords = []
-        col_num = 0
-        row_num = 0
-        for c in string:
-            if c == '1':
-                coords.append((row_num, col_num))
-            col_num += 1
-            if col_num % cols == 0:
-                row_num += 1
-                col_num = 0
-        return coords
+        return sum(min(distances[spaceship] for spaceship in spaceships)
+                   for distances in state.get_goal_distances())
 
 
 class Algorithm:
 
     def __init__(self):
         self.container = []
+        self.expanded = 0
 
     def get_path(self, state):
         self.container = [Node(state, None)]
+        self.expanded = 0
         while self.container:
             node = self.get_next_from_container()
             if node.state.is_goal_state():
                 return node.get_actions()
+            self.expanded += 1
             self.update_container(node)
         return None
 
-    def create_successors(self, node, is_heuristic):
+    def create_successors(self, node, heuristic_weight=0, greedy=False):
         successors = []
 
         for legal_action in node.state.get_legal_actions():
@@ -102,7 +92,7 @@ class Algorithm:
                 continue
 
             next_node = Node(next_state, legal_action)
-            node.add_child(next_node, is_heuristic)
+            node.add_child(next_node, heuristic_weight, greedy)
             successors.append(next_node)
         return successors
 
@@ -112,6 +102,9 @@ class Algorithm:
     def get_next_from_container(self):
         pass
 
+    def sprite_name(self):
+        return self.__class__.__name__.lower()
+
 
 # Uses DFS
 class Blue(Algorithm):
@@ -134,6 +127,7 @@ class Blue(Algorithm):
                 continue
 
             self.visited.add(state_key)
+            self.expanded += 1
 
             for action in reversed(node.state.get_legal_actions()):
                 next_state = node.state.generate_successor_state(action)
@@ -172,6 +166,7 @@ class Red(Algorithm):
                 continue
 
             self.visited.add(state_key)
+            self.expanded += 1
 
             for action in node.state.get_legal_actions():
                 next_state = node.state.generate_successor_state(action)
@@ -199,7 +194,7 @@ class Black(Algorithm):
         return heapq.heappop(self.container)
 
     def update_container(self, node):
-        successors = self.create_successors(node, False)
+        successors = self.create_successors(node)
 
         for successor in successors:
             state = successor.state
@@ -211,17 +206,29 @@ class Black(Algorithm):
             self.best_costs[num] = successor.cost
             heapq.heappush(self.container, successor)
 
-# Uses A*
+# Uses A*, weighted A* (f = g + w * h) or greedy best-first (f = h)
+# Since the heuristic is admissible and cheaper paths to a state are re-queued,
+# weighted A* returns a path whose cost is at most weight times the optimal cost.
+# Greedy best-first gives no bound on the cost.
 class White(Algorithm):
-    def __init__(self):
+    def __init__(self, weight=1, greedy=False):
         super().__init__()
+        if weight < 1:
+            raise Exception(f'ERROR: A* weight must be at least 1 but {weight} was given.')
+        self.weight = weight
+        self.greedy = greedy
+        self.best_costs = {}
+
+    def get_path(self, state):
         self.best_costs = {}
+        state.get_goal_distances()  # built once here, successors share the tables
+        return super().get_path(state)
 
     def get_next_from_container(self):
         return heapq.heappop(self.container)
 
     def update_container(self, node):
-        successors = self.create_successors(node, True)
+        successors = self.create_successors(node, self.weight, self.greedy)
         for successor in successors:
             state = successor.state
             num = state.get_state('S')
@@ -241,3 +248,134 @@ class ExampleAlgorithm(Algorithm):
             path.append(action)
             state = state.generate_successor_state(action)
         return path
+
+
+# Uses BFS (unit_cost) or Branch n bound with delayed duplicate detection on disk.
+# States are packed into uint64 keys and searched bucket by bucket in order of cost.
+# Successors are buffered in memory up to run_size and spilled as sorted runs,
+# a bucket is merged, stripped of duplicates and visited states and written as
+# (state, parent) pairs, which are also the parent links used to rebuild the path.
+class ExternalSearch(Algorithm):
+    unit_cost = False
+
+    def __init__(self, work_dir=None, run_size=None):
+        super().__init__()
+        self.work_dir = work_dir or config.WORK_FOLDER
+        self.run_size = run_size or config.EXTERNAL_RUN_SIZE
+        self.position_bits = 0
+        self.spaceships_count = 0
+
+    def encode(self, spaceships):
+        key = 0
+        shift = 0
+        while spaceships:
+            s = spaceships & -spaceships
+            key |= (s.bit_length() - 1) << shift
+            shift += self.position_bits
+            spaceships &= spaceships - 1
+        return key
+
+    def decode(self, key):
+        spaceships = 0
+        mask = (1 << self.position_bits) - 1
+        for i in range(self.spaceships_count):
+            spaceships |= 1 << ((key >> (i * self.position_bits)) & mask)
+        return spaceships
+
+    def get_action(self, parent_key, key):
+        parent, child = self.decode(parent_key), self.decode(key)
+        src, dst = (parent & ~child).bit_length() - 1, (child & ~parent).bit_length() - 1
+        return (src // config.N, src % config.N), (dst // config.N, dst % config.N)
+
+    def get_action_cost(self, action):
+        return 1 if self.unit_cost else State.get_action_cost(action)
+
+    def get_path(self, state):
+        self.position_bits = max(1, (state.bit_mask.bit_length() - 1).bit_length())
+        self.spaceships_count = bin(state.spaceships).count('1')
+        self.expanded = 0
+        if self.spaceships_count * self.position_bits > 64:
+            raise Exception(f'ERROR: {self.spaceships_count} spaceships do not fit into a 64 bit state key!')
+        if bin(state.goals).count('1') != self.spaceships_count:
+            return None
+        if not os.path.exists(self.work_dir):
+            os.mkdir(self.work_dir)
+        directory = tempfile.mkdtemp(dir=self.work_dir)
+        try:
+            return self.search(state, directory)
+        finally:
+            shutil.rmtree(directory)
+
+    def search(self, state, directory):
+        start, goal = self.encode(state.spaceships), self.encode(state.goals)
+        visited_path = os.path.join(directory, 'visited.bin')
+        external.write_run(visited_path, [])
+        buffer = {0: [(start, start)]}
+        buffered = 0
+        runs = {}
+
+        def spill(bucket):
+            path = os.path.join(directory, f'bucket_{bucket}_{len(runs.setdefault(bucket, []))}.bin')
+            external.write_run(path, itertools.chain.from_iterable(sorted(buffer.pop(bucket))))
+            runs[bucket].append(path)
+
+        while buffer or runs:
+            cost = min(buffer.keys() | runs.keys())
+            if cost in buffer:
+                buffered -= len(buffer[cost])
+                spill(cost)
+            layer_path = os.path.join(directory, f'layer_{cost}.bin')
+            with external.RunWriter(layer_path) as layer:
+                for key, parent_key in external.subtract(external.merge_pairs(runs[cost]), visited_path):
+                    layer.append(key, parent_key)
+            for path in runs.pop(cost):
+                os.remove(path)
+
+            merged_path = os.path.join(directory, 'visited_merged.bin')
+            with external.RunWriter(merged_path) as merged:
+                for key in heapq.merge(external.read_run(visited_path),
+                                       (key for key, _ in external.read_pairs(layer_path))):
+                    merged.append(key)
+            os.replace(merged_path, visited_path)
+
+            if external.find_parent(layer_path, goal) is not None:
+                return self.rebuild_path(directory, goal, cost)
+
+            current = copy.copy(state)
+            for key, _ in external.read_pairs(layer_path):
+                self.expanded += 1
+                current.spaceships = self.decode(key)
+                for action in current.get_legal_actions():
+                    (src_row, src_col), (dst_row, dst_col) = action
+                    spaceships = current.spaceships & ~(1 << (src_row * config.N + src_col))
+                    spaceships |= 1 << (dst_row * config.N + dst_col)
+                    buffer.setdefault(cost + self.get_action_cost(action), []).append((self.encode(spaceships), key))
+                    buffered += 1
+                if buffered >= self.run_size:
+                    for bucket in list(buffer):
+                        spill(bucket)
+                    buffered = 0
+        return None
+
+    def rebuild_path(self, directory, key, cost):
+        actions = []
+        while cost > 0:
+            parent_key = external.find_parent(os.path.join(directory, f'layer_{cost}.bin'), key)
+            action = self.get_action(parent_key, key)
+            actions.append(action)
+            cost -= self.get_action_cost(action)
+            key = parent_key
+        actions.reverse()
+        return actions
+
+
+class ExternalRed(ExternalSearch):
+    unit_cost = True
+
+    def sprite_name(self):
+        return 'red'
+
+
+class ExternalBlack(ExternalSearch):
+    def sprite_name(self):
+        return 'black'
@@ -0,0 +1,50 @@
+import os
+import time
+
+import pygame
+
+import config
+
+
+class Assets:
+    """
+    All images from IMG_FOLDER loaded once and scaled per tile size.
+    Sprites share these surfaces, so they must never be drawn on.
+    """
+    atlases = {}
+    load_time = 0.0
+
+    @staticmethod
+    def atlas(size):
+        if size not in Assets.atlases:
+            start_time = time.time()
+            atlas = {}
+            for image_name in sorted(os.listdir(config.IMG_FOLDER)):
+                image = pygame.image.load(os.path.join(config.IMG_FOLDER, image_name)).convert()
+                image = pygame.transform.scale(image, size)
+                image.set_colorkey(config.WHITE)
+                atlas[image_name] = image
+            Assets.atlases[size] = atlas
+            Assets.load_time += time.time() - start_time
+        return Assets.atlases[size]
+
+    @staticmethod
+    def get(image_name, size):
+        return Assets.atlas(size)[image_name]
+
+    # draws the static sprite groups once into a single surface
+    @staticmethod
+    def compose(size, *groups):
+        surface = pygame.Surface(size).convert()
+        surface.fill(config.WHITE)
+        for group in groups:
+            group.draw(surface)
+        return surface
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    @staticmethod
+    def memory():
+        return sum(Assets.surface_bytes(image) for atlas in Assets.atlases.values() for image in atlas.values())
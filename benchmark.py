@@ -0,0 +1,120 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import config
+import registry
+from state import State
+
+WEIGHTS = [1.5, 2, 3, 5]
+
+
+def path_cost(path):
+    return sum(State.get_action_cost(action) for action in path)
+
+
+def run(algorithm, state):
+    start_time = time.time()
+    path = algorithm.get_path(state)
+    return path, time.time() - start_time
+
+
+# optimal cost comes from Black (branch and bound, no heuristic) so a bad heuristic cannot hide
+# in the reference, speedups are relative to the unweighted run of the benchmarked algorithm
+def benchmark_map(map_name, algorithm_name):
+    state = State.load(map_name)
+    optimal_path, _ = run(registry.create('Black'), state)
+    if optimal_path is None:
+        print(f'{map_name}: no solution')
+        return
+    optimal_cost = path_cost(optimal_path)
+    reference = registry.create(algorithm_name)
+    reference_path, reference_time = run(reference, state)
+    reference_expanded = reference.expanded
+    if path_cost(reference_path) != optimal_cost:
+        raise Exception(f'ERROR: {algorithm_name} on {map_name} is not optimal '
+                        f'with cost {path_cost(reference_path)} instead of {optimal_cost}!')
+    print(f'{map_name} ({algorithm_name}): optimal cost {optimal_cost}, '
+          f'{reference_expanded} expanded, {reference_time:.3f}s')
+    variants = [(f'w={weight}', registry.create(algorithm_name, weight), weight) for weight in WEIGHTS]
+    variants.append(('greedy', registry.create(algorithm_name, 'greedy'), None))
+    for label, algorithm, bound in variants:
+        path, elapsed_time = run(algorithm, state)
+        cost = path_cost(path)
+        ratio = cost / optimal_cost
+        if bound is not None and ratio > bound:
+            raise Exception(f'ERROR: {label} on {map_name} exceeded its bound with cost ratio {ratio:.3f}!')
+        print(f'  {label:>7}: cost {cost} (ratio {ratio:.3f}), '
+              f'{algorithm.expanded} expanded (speedup {reference_expanded / max(algorithm.expanded, 1):.1f}x), '
+              f'{elapsed_time:.3f}s (speedup {reference_time / max(elapsed_time, 1e-9):.1f}x)')
+
+
+def map_cells(map_name):
+    with open(os.path.join(config.MAP_FOLDER, map_name), 'r') as file:
+        lines = file.readlines()
+    return len(lines) * len(lines[0].strip())
+
+
+# surface memory and load time of the sprites, needs a display (SDL_VIDEODRIVER=dummy works)
+def benchmark_assets(map_name):
+    import pygame
+    from assets import Assets
+    from game import Game
+
+    start_time = time.time()
+    g = Game('ExampleAlgorithm', map_name, 0)
+    elapsed_time = time.time() - start_time
+    sprites_count = sum(len(group) for group in (g.empty_sprites, g.goals_sprites,
+                                                 g.obstacles_sprites, g.balls_sprites))
+    tile_bytes = config.TILE_SIZE * config.TILE_SIZE * g.background.get_bytesize()
+    print(f'{map_name}: {config.M}x{config.N} tiles of {config.TILE_SIZE}px, {sprites_count} sprites')
+    print(f'  map loaded in {elapsed_time:.3f}s, images loaded in {Assets.load_time:.3f}s')
+    print(f'  atlas {Assets.memory() / 1024:.0f} KB, background {Assets.surface_bytes(g.background) / 1024:.0f} KB, '
+          f'per sprite copies would take {sprites_count * tile_bytes / 1024:.0f} KB')
+    pygame.quit()
+
+
+# requests per second of the solve service against one solve.py invocation per request,
+# the service caches only per-map preparation (parsing and goal distance tables), so every
+# repeated request is still solved from scratch, the time a warm map saves is reported separately
+def benchmark_service(algorithm_name, repeats=5):
+    maps = sorted(os.listdir(config.MAP_FOLDER)) * repeats
+    start_time = time.time()
+    for map_name in maps:
+        subprocess.run([sys.executable, os.path.join(config.GAME_FOLDER, 'solve.py'), algorithm_name, map_name],
+                       stdout=subprocess.DEVNULL, check=True)
+    cli_rate = len(maps) / (time.time() - start_time)
+    requests = ''.join(json.dumps({'id': i, 'map_path': map_name, 'algorithm': algorithm_name}) + '\n'
+                       for i, map_name in enumerate(maps))
+    start_time = time.time()
+    responses = subprocess.run([sys.executable, os.path.join(config.GAME_FOLDER, 'service.py')], input=requests,
+                               capture_output=True, text=True, check=True).stdout.splitlines()
+    service_rate = len(maps) / (time.time() - start_time)
+    if len(responses) != len(maps) or any('error' in json.loads(response) for response in responses):
+        raise Exception('ERROR: Solve service did not answer every request!')
+    warm = sum(json.loads(response)['warm'] for response in responses)
+    print(f'{algorithm_name}, {len(maps)} requests: CLI {cli_rate:.1f} req/s, service {service_rate:.1f} req/s '
+          f'(speedup {service_rate / cli_rate:.1f}x), {warm} on warm maps')
+    from service import prepare_map
+    preparation_times = []
+    for map_name in sorted(set(maps)):
+        with open(os.path.join(config.MAP_FOLDER, map_name), 'r') as file:
+            map_text = file.read().strip()
+        start_time = time.perf_counter()
+        prepare_map(map_text)
+        preparation_times.append(time.perf_counter() - start_time)
+    print(f'  a warm map saves its preparation, {sum(preparation_times) / len(preparation_times) * 1000:.3f} ms '
+          f'on average and {max(preparation_times) * 1000:.3f} ms at most')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--assets':
+        benchmark_assets(sys.argv[2] if len(sys.argv) > 2 else max(os.listdir(config.MAP_FOLDER), key=map_cells))
+    elif len(sys.argv) > 1 and sys.argv[1] == '--service':
+        benchmark_service(sys.argv[2] if len(sys.argv) > 2 else 'White')
+    else:
+        for algorithm_name in registry.names(registry.OPTIMAL, registry.WEIGHTED):
+            for map_filename in sys.argv[1:] or sorted(os.listdir(config.MAP_FOLDER)):
+                benchmark_map(map_filename, algorithm_name)
@@ -2,22 +2,27 @@ import os
 
 import screeninfo
 
-monitor = screeninfo.get_monitors()[0]
+try:
+    monitor = screeninfo.get_monitors()[0]
+    SCREEN_WIDTH, SCREEN_HEIGHT = monitor.width, monitor.height
+except screeninfo.ScreenInfoError:
+    # headless (benchmarks, batch solving), screen size is only used for tile scaling
+    SCREEN_WIDTH, SCREEN_HEIGHT = 1920, 1080
 
 # parameters
 M = None
 N = None
-SCREEN_WIDTH = monitor.width
-SCREEN_HEIGHT = monitor.height
 MIN_TILE_SIZE = 32
 TILE_SIZE = 64
 MAX_TILE_SIZE = 128
-TILE_STEP = 0.05
-TILE_OFFSET = None
+SPACESHIP_SPEED = 6  # tiles per second
 INFO_FONT = None
 INFO_HEIGHT = 30
 INFO_SIDE_OFFSET = 10
 FRAMES_PER_SEC = 120
+EXTERNAL_RUN_SIZE = 1 << 20  # successors buffered in memory before spilling a sorted run
+SERVICE_CACHE_SIZE = 32  # maps kept warm by every solve service worker
+SERVICE_MAX_TIME = 60  # default seconds a solve service request may take, 0 for no limit
 
 # define colors
 WHITE = (255, 255, 255)
@@ -33,3 +38,5 @@ MAP_FOLDER = os.path.join(GAME_FOLDER, 'maps')
 IMG_FOLDER = os.path.join(GAME_FOLDER, 'img')
 LOG_FOLDER = os.path.join(GAME_FOLDER, 'logs')
 FONT_FOLDER = os.path.join(GAME_FOLDER, 'fonts')
+WORK_FOLDER = os.path.join(GAME_FOLDER, 'work')
+SOLVER_FOLDER = os.path.join(GAME_FOLDER, 'solvers')
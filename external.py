@@ -0,0 +1,97 @@
+"""
+Helpers for the external-memory searches in algorithms.py.
+States are stored as uint64 keys in sorted runs on disk, either alone
+(visited set) or as (state, parent) pairs sorted by state (frontier and parent links).
+Runs are read through mmap, so only the pages being merged are kept in memory.
+"""
+import heapq
+import mmap
+import os
+from array import array
+
+
+def write_run(path, values):
+    with open(path, 'wb') as file:
+        array('Q', values).tofile(file)
+
+
+class RunWriter:
+    """Streams uint64 values to a run file in chunks."""
+
+    def __init__(self, path, chunk_size=1 << 16):
+        self.file = open(path, 'wb')
+        self.chunk = array('Q')
+        self.chunk_size = chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.chunk.tofile(self.file)
+        self.file.close()
+
+    def append(self, *values):
+        self.chunk.extend(values)
+        if len(self.chunk) >= self.chunk_size:
+            self.chunk.tofile(self.file)
+            self.chunk = array('Q')
+
+
+def read_run(path, stride=1):
+    if not os.path.getsize(path):
+        return
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm).cast('Q')
+        try:
+            if stride == 1:
+                yield from view
+            else:
+                for i in range(0, len(view), stride):
+                    yield tuple(view[i:i + stride])
+        finally:
+            view.release()
+
+
+def read_pairs(path):
+    return read_run(path, 2)
+
+
+def merge_pairs(paths):
+    """Merges pair runs and keeps the first pair for every state."""
+    last = None
+    for state, parent in heapq.merge(*(read_pairs(path) for path in paths)):
+        if state != last:
+            last = state
+            yield state, parent
+
+
+def subtract(pairs, visited_path):
+    """Drops the pairs whose state is in the sorted visited run."""
+    visited = read_run(visited_path)
+    current = next(visited, None)
+    for state, parent in pairs:
+        while current is not None and current < state:
+            current = next(visited, None)
+        if current != state:
+            yield state, parent
+    visited.close()
+
+
+def find_parent(path, state):
+    if not os.path.getsize(path):
+        return None
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm).cast('Q')
+        try:
+            low, high = 0, len(view) // 2
+            while low < high:
+                middle = (low + high) // 2
+                if view[2 * middle] < state:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low < len(view) // 2 and view[2 * low] == state:
+                return view[2 * low + 1]
+            return None
+        finally:
+            view.release()
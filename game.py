@@ -7,8 +7,11 @@ from queue import Queue
 import pygame
 
 import config
+import registry
+from assets import Assets
 from sprites import Spaceship, Goal, Obstacle, Empty
 from state import State
+from timeline import Timeline
 from util import TimedFunction, Timeout, Logger
 
 
@@ -33,7 +36,6 @@ class Game:
             raise Exception(f'ERROR: Lower the number of columns in map! '
                             f'MIN_TILE_SIZE is {config.MIN_TILE_SIZE}px but {tile_width}px occurred.')
         config.TILE_SIZE = int(min(config.MAX_TILE_SIZE, tile_height, tile_width))
-        config.TILE_OFFSET = int(config.TILE_SIZE * config.TILE_STEP)
         self.WIDTH = config.N * config.TILE_SIZE
         self.HEIGHT = config.M * config.TILE_SIZE
         self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT + config.INFO_HEIGHT), flags=pygame.HIDDEN)
@@ -62,7 +64,7 @@ class Game:
                         tile.add(self.empty_sprites)
                         if char != Empty.kind():
                             if char == Spaceship.kind():
-                                sprite = Spaceship((i, j), self.algorithm.__class__.__name__.lower())
+                                sprite = Spaceship((i, j), self.algorithm.sprite_name())
                                 sprite.add(self.balls_sprites)
                                 self.balls_map[(i, j)] = sprite
                                 balls_bits |= bit
@@ -78,6 +80,8 @@ class Game:
                                 raise Exception(f'ERROR: Illegal character {char} in map!')
                         bit <<= 1
             self.initial_state = State(bit_mask, balls_bits, obstacles_bits, goals_bits)
+            self.background = Assets.compose((self.WIDTH, self.HEIGHT),
+                                             self.empty_sprites, self.goals_sprites, self.obstacles_sprites)
         except Exception as e:
             raise e
 
@@ -93,14 +97,17 @@ class Game:
         self.balls_sprites = None
         self.obstacles_sprites = None
         self.goals_sprites = None
+        self.background = None
         self.balls_map = None
         self.initial_state = None
+        self.timeline = None
+        self.play_time = 0.0
         self.running = True
         self.playing = False
         self.done = False
         self.path = None
         self.cost = 0
-        self.algorithm = algorithm
+        self.algorithm = registry.create(algorithm) if isinstance(algorithm, str) else algorithm
         self.max_elapsed_time = max_time
         self.load_map(map_name)
         self.clock = pygame.time.Clock()
@@ -133,15 +140,15 @@ class Game:
         path = copy.copy(self.path)
         if not path:
             raise Exception(f'Path is empty!')
-        state = copy.copy(self.initial_state)
         path_len = len(path)
-        for step in range(path_len):
+        state, self.cost, illegal_step = self.initial_state.validate_path(path)
+        for step in range(path_len if illegal_step is None else illegal_step):
             action = path[step]
             src, dst = action
             self.logger.log_info(f'Step {(step + 1):03} - from {src} to {dst} ; '
                                  f'cost {State.get_action_cost(action)}', to_std_out=True)
-            self.cost += State.get_action_cost(action)
-            state = state.generate_successor_state(action)
+        if illegal_step is not None:
+            raise Exception(f'Illegal action {path[illegal_step]} at step {illegal_step + 1}!')
         self.logger.log_info(f'Path length is {path_len} steps.', to_std_out=True)
         self.logger.log_info(f'Path cost is {self.cost} units.', to_std_out=True)
         if not state.is_goal_state():
@@ -153,40 +160,22 @@ class Game:
             self.screen = pygame.display.set_mode((self.WIDTH, self.HEIGHT + config.INFO_HEIGHT),
                                                   flags=pygame.SHOWN)
             self.check_legal_path()
-            balls_map = copy.copy(self.balls_map)
-            path = copy.copy(self.path)
-            state = copy.copy(self.initial_state)
-            step = 0
-            action = path[step]
-            src, dst = action
+            sprites = list(self.balls_map.values())
+            self.timeline = Timeline(list(self.balls_map.keys()), self.path, config.SPACESHIP_SPEED)
+            self.clock.tick()
             while self.running:
                 try:
                     try:
+                        elapsed_time = self.clock.tick(config.FRAMES_PER_SEC) / 1000
                         if self.playing and not self.done:
-                            try:
-                                if not balls_map[src].move_towards(dst):
-                                    balls_map[dst] = balls_map[src]
-                                    del balls_map[src]
-                                    state = state.generate_successor_state(action)
-                                    step += 1
-                                    action = path[step]
-                                    src, dst = action
-                            except IndexError:
-                                self.done = True
+                            self.play_time = min(self.play_time + elapsed_time, self.timeline.duration)
+                            self.done = self.play_time >= self.timeline.duration
+                        for sprite, position in zip(sprites, self.timeline.positions_at(self.play_time)):
+                            sprite.place_to(position)
                         self.draw()
                         self.events()
-                        self.clock.tick(config.FRAMES_PER_SEC)
                     except SimulateToEnd:
-                        balls_map = copy.copy(self.balls_map)
-                        path = copy.copy(self.path)
-                        state = copy.copy(self.initial_state)
-                        for step in range(len(path)):
-                            action = path[step]
-                            src, dst = action
-                            balls_map[dst] = balls_map[src]
-                            balls_map[dst].place_to(dst)
-                            del balls_map[src]
-                            state = state.generate_successor_state(action)
+                        self.play_time = self.timeline.duration
                         self.playing = False
                 except Quit:
                     self.running = self.playing = False
@@ -203,10 +192,7 @@ class Game:
         pygame.display.flip()
 
     def draw(self):
-        self.screen.fill(config.WHITE)
-        self.empty_sprites.draw(self.screen)
-        self.goals_sprites.draw(self.screen)
-        self.obstacles_sprites.draw(self.screen)
+        self.screen.blit(self.background, (0, 0))
         self.balls_sprites.draw(self.screen)
         self.draw_info_text()
 
@@ -216,6 +202,9 @@ class Game:
             if event.type == pygame.QUIT or event.type == pygame.WINDOWCLOSE or \
                     event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 raise Quit()
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                self.seek(1 if event.key == pygame.K_RIGHT else -1)
+                continue
             if self.done:
                 return
             if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
@@ -223,3 +212,13 @@ class Game:
             elif event.type == pygame.KEYDOWN and event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
                 self.done = True
                 raise SimulateToEnd()
+
+    # jumps to the start of the previous or next step
+    def seek(self, direction):
+        step = self.timeline.step_at(self.play_time)
+        if direction < 0 and self.play_time == self.timeline.time_of(step):
+            step -= 1
+        elif direction > 0:
+            step += 1
+        self.play_time = self.timeline.time_of(step)
+        self.done = self.play_time >= self.timeline.duration
@@ -0,0 +1,119 @@
+"""
+Registry of solver entry points.
+Solvers are registered as 'module:attribute' strings and imported only when selected.
+Besides the built-in ones, solvers are discovered from:
+ - SOLVER_FOLDER, every solvers/<name>.py module defines a class named Solver,
+   registered as <name>, and may list its capabilities in a module level
+   CAPABILITIES tuple of string literals, read from the source without importing it,
+ - the 'lost_in_spyce.solvers' entry point group, extras of an entry point
+   are its capabilities (e.g. 'MySolver = package.module:MySolver [optimal]').
+"""
+import ast
+import os
+from importlib import import_module
+
+import config
+
+OPTIMAL = 'optimal'  # lowest path cost
+OPTIMAL_MOVES = 'optimal_moves'  # fewest moves
+WEIGHTED = 'weighted'  # accepts a heuristic weight
+EXTERNAL = 'external'  # keeps the search on disk
+PARALLEL = 'parallel'
+NEEDS_HEURISTIC_DB = 'needs_heuristic_db'
+
+ENTRY_POINT_GROUP = 'lost_in_spyce.solvers'
+
+
+class Solver:
+    def __init__(self, name, target, capabilities=None, source=None):
+        self.name = name
+        self.target = target
+        self.declared_capabilities = capabilities
+        self.source = source
+        self.solver_class = None
+
+    def load(self):
+        if self.solver_class is None:
+            module_name, attribute = self.target.split(':')
+            self.solver_class = getattr(import_module(module_name), attribute)
+        return self.solver_class
+
+    def create(self, *args):
+        return self.load()(*args)
+
+    @property
+    def capabilities(self):
+        if self.declared_capabilities is None:
+            self.declared_capabilities = read_capabilities(self.source) if self.source else frozenset()
+        return self.declared_capabilities
+
+
+def read_capabilities(path):
+    with open(path, 'r') as file:
+        module = ast.parse(file.read(), path)
+    for statement in module.body:
+        if isinstance(statement, ast.Assign) and \
+                any(isinstance(target, ast.Name) and target.id == 'CAPABILITIES' for target in statement.targets):
+            return frozenset(ast.literal_eval(statement.value))
+    return frozenset()
+
+
+solvers = {}
+discovered = False
+
+
+def register(name, target, *capabilities):
+    solvers[name] = Solver(name, target, frozenset(capabilities))
+
+
+def discover():
+    global discovered
+    if discovered:
+        return
+    discovered = True
+    if os.path.isdir(config.SOLVER_FOLDER):
+        package = os.path.basename(config.SOLVER_FOLDER)
+        for filename in sorted(os.listdir(config.SOLVER_FOLDER)):
+            name, extension = os.path.splitext(filename)
+            if extension == '.py' and not name.startswith('_'):
+                solvers.setdefault(name, Solver(name, f'{package}.{name}:Solver',
+                                                source=os.path.join(config.SOLVER_FOLDER, filename)))
+    from importlib.metadata import entry_points
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        solvers.setdefault(entry_point.name,
+                           Solver(entry_point.name, f'{entry_point.module}:{entry_point.attr}',
+                                  frozenset(entry_point.extras)))
+
+
+def get(name):
+    if name not in solvers:
+        discover()
+    if name not in solvers:
+        raise Exception(f'ERROR: Unknown algorithm {name}!')
+    return solvers[name]
+
+
+# weight is a number >= 1 or 'greedy' for greedy best-first, only for weighted solvers
+def create(name, weight=None):
+    solver = get(name)
+    if weight is None:
+        return solver.create()
+    if WEIGHTED not in solver.capabilities:
+        raise Exception(f'ERROR: Algorithm {name} does not accept a weight!')
+    return solver.create(*((1, True) if weight == 'greedy' else (float(weight),)))
+
+
+def names(*capabilities):
+    discover()
+    if not capabilities:
+        return list(solvers)
+    return [name for name, solver in solvers.items() if solver.capabilities.issuperset(capabilities)]
+
+
+register('ExampleAlgorithm', 'algorithms:ExampleAlgorithm')
+register('Blue', 'algorithms:Blue')
+register('Red', 'algorithms:Red', OPTIMAL_MOVES)
+register('Black', 'algorithms:Black', OPTIMAL)
+register('White', 'algorithms:White', OPTIMAL, WEIGHTED)
+register('ExternalRed', 'algorithms:ExternalRed', OPTIMAL_MOVES, EXTERNAL)
+register('ExternalBlack', 'algorithms:ExternalBlack', OPTIMAL, EXTERNAL)
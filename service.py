@@ -0,0 +1,193 @@
+"""
+Long-running solve service speaking JSON lines on stdin/stdout or on a Unix socket.
+Request:  {"id": 1, "map": "<map text>" or "map_path": "map1.txt", "algorithm": "White", "weight": 2,
+           "max_time": 10}
+Response: {"id": 1, "path": [[[src_row, src_col], [dst_row, dst_col]], ...], "length": 9, "cost": 30,
+           "time": 0.012, "warm": true} or {"id": 1, "error": "..."}
+Requests are spread over a pool of worker processes. Every worker keeps the parsed
+maps with their goal distance tables (the A* heuristic data) in a bounded LRU,
+so a repeated map skips that preparation (warm).
+max_time defaults to SERVICE_MAX_TIME seconds, 0 means no limit.
+Usage: python service.py [--socket <path>] [--workers <count>]
+"""
+import os
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import json
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from queue import Queue
+
+import config
+import registry
+from state import State
+from util import TimedFunction, Timeout
+
+# per worker process: map text -> (state with its goal distance tables, M, N)
+cache = OrderedDict()
+
+
+def prepare_map(map_text):
+    state = State.from_lines(map_text.splitlines())
+    state.get_goal_distances()
+    return state, config.M, config.N
+
+
+def get_map(map_text):
+    if map_text in cache:
+        cache.move_to_end(map_text)
+        return cache[map_text], True
+    cache[map_text] = prepare_map(map_text)
+    if len(cache) > config.SERVICE_CACHE_SIZE:
+        cache.popitem(last=False)
+    return cache[map_text], False
+
+
+# runs the algorithm the same way Game.get_path does, so it can be stopped after max_time
+def get_path(algorithm, state, max_time):
+    tf_queue = Queue(1)
+    tf = TimedFunction(threading.current_thread().ident, tf_queue, max_time, algorithm.get_path, state)
+    tf.daemon = True
+    tf.start()
+    try:
+        while tf_queue.empty() and tf.is_alive():
+            time.sleep(0.001)
+    except Timeout:
+        raise Exception(f'Algorithm took more than {max_time} seconds!')
+    if tf_queue.empty():
+        raise Exception('Algorithm failed!')
+    return tf_queue.get(block=False)
+
+
+def solve(request_id, map_text, algorithm_name, weight, max_time):
+    try:
+        (state, config.M, config.N), warm = get_map(map_text)
+        algorithm = registry.create(algorithm_name, weight)
+        path, elapsed_time = get_path(algorithm, state, max_time)
+        if path is None:
+            raise Exception('No solution!')
+        final_state, cost, illegal_step = state.validate_path(path)
+        if illegal_step is not None or not final_state.is_goal_state():
+            raise Exception(f'Algorithm {algorithm_name} returned an invalid path!')
+        return {'id': request_id, 'path': path, 'length': len(path), 'cost': cost,
+                'time': elapsed_time, 'warm': warm}
+    except Exception as e:
+        return {'id': request_id, 'error': str(e)}
+
+
+class Service:
+    def __init__(self, workers):
+        self.workers = workers
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.lock = threading.Lock()
+
+    def shutdown(self):
+        self.pool.shutdown()
+
+    # a crashed worker breaks the pool, replace it so later requests are served
+    def replace_broken_pool(self, pool):
+        with self.lock:
+            if self.pool is pool:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+                pool.shutdown(wait=False)
+
+    def submit(self, line, respond):
+        request = None
+        try:
+            request = json.loads(line)
+            if 'map' in request:
+                map_text = request['map'].strip()
+            elif 'map_path' not in request:
+                raise Exception('ERROR: Request needs a map or a map_path!')
+            else:
+                with open(os.path.join(config.MAP_FOLDER, request['map_path']), 'r') as file:
+                    map_text = file.read().strip()
+            args = (request.get('id'), map_text, request.get('algorithm', 'ExampleAlgorithm'),
+                    request.get('weight'), request.get('max_time', config.SERVICE_MAX_TIME))
+            pool = self.pool
+            try:
+                future = pool.submit(solve, *args)
+            except BrokenProcessPool:
+                self.replace_broken_pool(pool)
+                pool = self.pool
+                future = pool.submit(solve, *args)
+        except Exception as e:
+            respond({'id': request.get('id') if isinstance(request, dict) else None, 'error': str(e)})
+            return
+
+        def done(f):
+            try:
+                response = f.result()
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    self.replace_broken_pool(pool)
+                response = {'id': request.get('id'), 'error': f'Worker failed: {e!r}'}
+            respond(response)
+
+        future.add_done_callback(done)
+
+    def serve(self, lines, write):
+        condition = threading.Condition()
+        pending = 0
+
+        def respond(response):
+            nonlocal pending
+            with condition:
+                write(json.dumps(response) + '\n')
+                pending -= 1
+                condition.notify_all()
+
+        for line in lines:
+            if line.strip():
+                with condition:
+                    pending += 1
+                self.submit(line, respond)
+        with condition:
+            condition.wait_for(lambda: pending == 0)
+
+
+def serve_stdio(service):
+    def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    service.serve(sys.stdin, write)
+
+
+def serve_socket(service, path):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def write(text):
+                self.wfile.write(text.encode())
+                self.wfile.flush()
+
+            service.serve((line.decode() for line in self.rfile), write)
+
+    if os.path.exists(path):
+        os.remove(path)
+    with socketserver.ThreadingUnixStreamServer(path, Handler) as server:
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    workers = int(args[args.index('--workers') + 1]) if '--workers' in args else os.cpu_count()
+    solve_service = Service(workers)
+    try:
+        if '--socket' in args:
+            serve_socket(solve_service, args[args.index('--socket') + 1])
+        else:
+            serve_stdio(solve_service)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        solve_service.shutdown()
@@ -0,0 +1,26 @@
+import sys
+import time
+
+import registry
+from state import State
+
+# headless runner: python solve.py <algorithm> <map> [weight]
+# prints the path, one action per line, followed by its length and cost
+if __name__ == '__main__':
+    if len(sys.argv) < 3:
+        print(f'Usage: {sys.argv[0]} <algorithm> <map> [weight]\nAlgorithms: {", ".join(registry.names())}')
+        sys.exit(1)
+    algorithm = registry.create(sys.argv[1], sys.argv[3] if len(sys.argv) > 3 else None)
+    state = State.load(sys.argv[2])
+    start_time = time.time()
+    path = algorithm.get_path(state)
+    elapsed_time = time.time() - start_time
+    if path is None:
+        print(f'No solution, algorithm took {elapsed_time:.3f} seconds.')
+        sys.exit(1)
+    final_state, cost, illegal_step = state.validate_path(path)
+    if illegal_step is not None or not final_state.is_goal_state():
+        raise Exception(f'ERROR: Algorithm {sys.argv[1]} returned an invalid path!')
+    for src, dst in path:
+        print(f'{src} -> {dst}')
+    print(f'Path length is {len(path)} steps, cost is {cost} units, algorithm took {elapsed_time:.3f} seconds.')
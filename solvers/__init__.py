@@ -0,0 +1,7 @@
+"""
+Solver plugins, every <name>.py module here defines a Solver class
+(an algorithms.Algorithm subclass) and is selectable as <name>.
+Capabilities are declared with a module level tuple of string literals,
+e.g. CAPABILITIES = ('optimal',), which the registry reads without importing.
+Modules are imported only when their solver is selected.
+"""
@@ -25,6 +25,7 @@ _ _ _ _ O _ S    0 0 0 0 1 0 1    0 0 0 0 0 0 1     0 0 0 0 1 0 0    0 0 0 0 0 0
 """
 import copy
 import math
+import os
 
 import config
 from sprites import Spaceship, Obstacle, Goal, Empty
@@ -37,6 +38,32 @@ class State:
         self.obstacles = obstacles
         self.goals = goals
         self.row_masks = [((1 << config.N) - 1) << (i * config.N) for i in range(config.M - 1, -1, -1)]
+        self.goal_distances = None
+
+    @staticmethod
+    def from_lines(lines):
+        config.M = len(lines)
+        config.N = len(lines[0].strip())
+        bit = 1
+        bit_mask = (1 << (config.M * config.N)) - 1
+        spaceships = obstacles = goals = 0
+        for line in lines:
+            for char in line.strip():
+                if char == Spaceship.kind():
+                    spaceships |= bit
+                elif char == Obstacle.kind():
+                    obstacles |= bit
+                elif char == Goal.kind():
+                    goals |= bit
+                elif char != Empty.kind():
+                    raise Exception(f'ERROR: Illegal character {char} in map!')
+                bit <<= 1
+        return State(bit_mask, spaceships, obstacles, goals)
+
+    @staticmethod
+    def load(map_name):
+        with open(os.path.join(config.MAP_FOLDER, map_name), 'r') as file:
+            return State.from_lines(file.readlines())
 
     def __str__(self):
         return '\n'.join(
@@ -61,6 +88,19 @@ class State:
         else:
             return None
 
+    # For every goal, the Manhattan distance from each cell index to it.
+    # Goals never move, so the tables are built once and shared by all successor copies.
+    def get_goal_distances(self):
+        if self.goal_distances is None:
+            cells = [divmod(i, config.N) for i in range(config.M * config.N)]
+            goals = self.goals
+            self.goal_distances = []
+            while goals:
+                goal_row, goal_col = divmod((goals & -goals).bit_length() - 1, config.N)
+                self.goal_distances.append([abs(row - goal_row) + abs(col - goal_col) for row, col in cells])
+                goals &= goals - 1
+        return self.goal_distances
+
     def is_goal_state(self):
         return self.spaceships == self.goals
 
@@ -115,3 +155,51 @@ class State:
         mask = (1 << (action[1][0] * config.N + action[1][1])) & self.bit_mask
         copy_state.spaceships |= mask  # set spaceship to next position
         return copy_state
+
+    # Replays path checking every move with one slide against the current blockers,
+    # without building the legal action list. Returns (final_state, cost, illegal_step)
+    # where illegal_step is the index of the first illegal move (None if all are legal)
+    # and final_state and cost are taken just before it.
+    def validate_path(self, path):
+        spaceships = self.spaceships
+        cost = 0
+        illegal_step = None
+        for step, action in enumerate(path):
+            if not self.is_legal_slide(spaceships, action):
+                illegal_step = step
+                break
+            (src_row, src_col), (dst_row, dst_col) = action
+            spaceships &= ~(1 << (src_row * config.N + src_col))
+            spaceships |= 1 << (dst_row * config.N + dst_col)
+            cost += State.get_action_cost(action)
+        final_state = copy.copy(self)
+        final_state.spaceships = spaceships
+        return final_state, cost, illegal_step
+
+    def is_legal_slide(self, spaceships, action):
+        (src_row, src_col), (dst_row, dst_col) = action
+        if spaceships == self.goals or not (0 <= src_row < config.M and 0 <= src_col < config.N):
+            return False
+        src = 1 << (src_row * config.N + src_col)
+        if not spaceships & src or (src_row != dst_row) == (src_col != dst_col):
+            return False
+        blockers = (spaceships | self.obstacles) & ~src
+        row_step = (dst_row > src_row) - (dst_row < src_row)
+        col_step = (dst_col > src_col) - (dst_col < src_col)
+        row, col = src_row, src_col
+        while 0 <= (next_row := row + row_step) < config.M and 0 <= (next_col := col + col_step) < config.N \
+                and not (blockers >> (next_row * config.N + next_col)) & 1:
+            row, col = next_row, next_col
+        return (row, col) == (dst_row, dst_col)
+
+    # Validates many (map_name, path) pairs, each map is parsed only once.
+    @staticmethod
+    def validate_paths(pairs):
+        states = {}
+        results = []
+        for map_name, path in pairs:
+            if map_name not in states:
+                states[map_name] = (State.load(map_name), config.M, config.N)
+            state, config.M, config.N = states[map_name]
+            results.append(state.validate_path(path))
+        return results
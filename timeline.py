@@ -0,0 +1,46 @@
+from bisect import bisect_right
+
+from state import State
+
+
+class Timeline:
+    """
+    Solution path compiled into keyframes.
+    layouts[i] holds the position of every spaceship after i steps and
+    start_times[i] the time (in seconds) at which step i starts,
+    so seeking to any step is a single lookup.
+    """
+
+    def __init__(self, positions, path, tiles_per_sec):
+        self.path = path
+        self.layouts = [tuple(positions)]
+        self.movers = []
+        self.start_times = [0.0]
+        index = {position: i for i, position in enumerate(positions)}
+        layout = list(positions)
+        for src, dst in path:
+            mover = index.pop(src)
+            index[dst] = mover
+            layout[mover] = dst
+            self.movers.append(mover)
+            self.layouts.append(tuple(layout))
+            self.start_times.append(self.start_times[-1] + State.get_action_cost((src, dst)) / tiles_per_sec)
+        self.duration = self.start_times[-1]
+
+    def step_at(self, elapsed_time):
+        return min(bisect_right(self.start_times, elapsed_time) - 1, len(self.path))
+
+    def time_of(self, step):
+        return self.start_times[max(0, min(step, len(self.path)))]
+
+    def positions_at(self, elapsed_time):
+        elapsed_time = max(0.0, min(elapsed_time, self.duration))
+        step = self.step_at(elapsed_time)
+        if step == len(self.path):
+            return self.layouts[step]
+        positions = list(self.layouts[step])
+        mover = self.movers[step]
+        (src_row, src_col), (dst_row, dst_col) = positions[mover], self.layouts[step + 1][mover]
+        fraction = (elapsed_time - self.start_times[step]) / (self.start_times[step + 1] - self.start_times[step])
+        positions[mover] = (src_row + (dst_row - src_row) * fraction, src_col + (dst_col - src_col) * fraction)
+        return positions